@@ -0,0 +1,33 @@
+from manim import config
+
+# Level-of-detail policy shared by the scenes.
+# Detail is measured against the final 4k60 render (-qk --fps 60); at or above
+# that target every factor is 1.0 so the final output is unchanged, while
+# draft renders (-ql, -qm) do proportionally less geometric work.
+REFERENCE_PIXEL_WIDTH = 3840
+REFERENCE_FRAME_RATE = 60
+
+# Arrow streams show the direction of each current, so even the lowest
+# quality keeps a fifth of the full arrow density
+MIN_ARROW_DETAIL = 0.2
+
+
+def spatial_detail():
+    # Fraction of the reference horizontal resolution, capped at 1
+    return min(1.0, config.pixel_width / REFERENCE_PIXEL_WIDTH)
+
+
+def temporal_detail():
+    # Fraction of the reference frame rate, capped at 1
+    return min(1.0, config.frame_rate / REFERENCE_FRAME_RATE)
+
+
+def scaled_count(full_count, minimum=1):
+    # Scale a number of sub-pixel elements (curve components) by resolution.
+    # Not for markings a viewer reads, e.g. dial ticks stay fixed at 11.
+    return max(minimum, int(round(full_count * spatial_detail())))
+
+
+def arrow_detail():
+    # Arrow density factor: 0.22 at -ql, 0.33 -qm, 0.5 -qh, 0.67 -qp, 1.0 -qk
+    return max(MIN_ARROW_DETAIL, spatial_detail())
@@ -1,12 +1,7 @@
 from manim import *
 import numpy as np
 
-
-def normalize(v):
-    norm = np.linalg.norm(v)
-    if norm == 0:
-        return v
-    return v / norm
+from lod import spatial_detail, temporal_detail
 
 
 class Microcal(Scene):
@@ -19,25 +14,63 @@ class Microcal(Scene):
         rise_tau = 0.02
         base_time = 0.25
 
-        # Impact times
+        # Line spectrum of the source: photon energies, relative rates, colors
+        line_energies = [1.0, 3.0, 5.0]
+        line_weights = [0.5, 0.3, 0.2]
+        line_colors = [BLUE, YELLOW, RED]
+
+        # Featured impacts (shown slowly, one line each)
         t1 = base_time
         t2 = t1 + (2.0 * decay_tau)
         t3 = t2 + (5.0 * decay_tau)
 
-        impact_times = [t1, t2, t3]
-        amplitudes = [5.0, 1.0, 3.0]
-        photon_colors = [RED, BLUE, YELLOW]
+        featured_times = [t1, t2, t3]
+        featured_lines = [2, 0, 1]
+        featured_angles = [135 * DEGREES, 45 * DEGREES, 90 * DEGREES]
 
         scroll_window = 2
-        # Simulation duration
-        sim_end_time = t3 + scroll_window + 0.75
+        feature_end_time = t3 + scroll_window + 0.75
 
         # Animation speed adjustment (1.25x duration = 80% speed)
-        animation_duration = sim_end_time * 1.25
+        feature_duration = feature_end_time * 1.25
+
+        # Afterwards a seeded random stream builds up the spectrum (fast-forwarded).
+        # Impacts are spaced by at least a dead time of 3 decay constants, so a
+        # pulse never rides on more than ~5% of the previous one: pulses stay
+        # inside the scope and none are merged during another pulse's rise.
+        stream_rate = 2.0  # Mean impacts per unit time after the dead time
+        dead_time = 3.0 * decay_tau
+        stream_sim_time = 40.0
+        stream_duration = 12.0
+        sim_end_time = feature_end_time + stream_sim_time
+
+        rng = np.random.default_rng(7)
+        max_stream = int(stream_sim_time / dead_time)
+        stream_times = feature_end_time + np.cumsum(dead_time + rng.exponential(1 / stream_rate, max_stream))
+        stream_times = stream_times[stream_times < sim_end_time - dead_time]
+        n_stream = len(stream_times)
+        stream_lines = rng.choice(len(line_energies), size=n_stream, p=line_weights)
+        stream_angles = rng.uniform(45 * DEGREES, 135 * DEGREES, n_stream)
+
+        impact_times = np.concatenate([featured_times, stream_times])
+        event_lines = np.concatenate([featured_lines, stream_lines]).astype(int)
+        event_angles = np.concatenate([featured_angles, stream_angles])
+        amplitudes = np.array(line_energies)[event_lines]
+        n_events = len(impact_times)
+
+        # Spectrum binning (bin width 0.4 puts each line at a bin center)
+        n_bins = 15
+        energy_max = 6.0
 
         # --- 2. PRE-CALCULATE DATA (High Res & Double Exp) ---
-        # Resolution must be very high to prevent peak jitter
-        dt = 0.0005
+        # Resolution must be very high to prevent peak jitter.
+        # Jitter is only visible frame to frame, so the step relaxes with frame rate
+        # (0.0005 at 60 fps and above).
+        dt = 0.0005 / temporal_detail()
+
+        # Drawn point spacing in time; keeps ~1 point per pixel of scope width
+        # (every 2nd sample at 4k60).
+        draw_step = max(1, int(round(0.001 / spatial_detail() / dt)))
 
         # Start time array at negative window so the graph starts "full"
         time_array = np.arange(-scroll_window, sim_end_time, dt)
@@ -55,14 +88,15 @@ class Microcal(Scene):
         for i, t_impact in enumerate(impact_times):
             amp = amplitudes[i]
 
-            # Identify valid times (t > t_impact)
-            mask = time_array > t_impact
-            dt_rel = time_array[mask] - t_impact
+            # Identify valid times (t > t_impact); the tail is negligible after ~15 tau
+            start = np.searchsorted(time_array, t_impact, side="right")
+            end = np.searchsorted(time_array, t_impact + 15 * decay_tau)
+            dt_rel = time_array[start:end] - t_impact
 
             # Double Exponential Formula: A * (exp(-t/fall) - exp(-t/rise))
             pulse = amp * norm_factor * (np.exp(-dt_rel / decay_tau) - np.exp(-dt_rel / rise_tau))
 
-            temp_array[mask] += pulse
+            temp_array[start:end] += pulse
 
         # --- 3. LAYOUT ---
         bath_line = Line(LEFT * 6 + DOWN * 2, LEFT * 2 + DOWN * 2)
@@ -84,12 +118,13 @@ class Microcal(Scene):
         tes_lbl = Text("Detector", font_size=24).move_to(tes)
 
         # -- Scope Box --
+        scope_max = 8
         axes = Axes(
             x_range=[0, scroll_window],
-            y_range=[0, 8],
-            x_length=6, y_length=4,
+            y_range=[0, scope_max],
+            x_length=6, y_length=3,
             axis_config={"include_tip": False, "include_numbers": False, "stroke_width": 0}
-        ).to_edge(RIGHT).shift(LEFT * 0.5)
+        ).to_edge(RIGHT).shift(LEFT * 0.5 + UP * 1.3)
 
         box = Rectangle(
             width=axes.x_length,
@@ -101,8 +136,25 @@ class Microcal(Scene):
         y_lbl = Text("Temperature", font_size=24).rotate(90 * DEGREES).next_to(box, LEFT, buff=0.3)
         x_lbl = Text("Time", font_size=24).next_to(box, DOWN)
 
+        # -- Spectrum Box (below the scope) --
+        hist_box = Rectangle(
+            width=axes.x_length,
+            height=1.5,
+            color=WHITE,
+            stroke_width=2
+        ).next_to(x_lbl, DOWN, buff=0.3)
+
+        hist_y_lbl = Text("Counts", font_size=24).rotate(90 * DEGREES).next_to(hist_box, LEFT, buff=0.3)
+        hist_ticks = VGroup(*[
+            Text(f"{e:g}", font_size=18).next_to(
+                hist_box.get_corner(DL) + RIGHT * (hist_box.width * e / energy_max), DOWN, buff=0.1)
+            for e in line_energies
+        ])
+        hist_x_lbl = Text("Energy", font_size=24).next_to(hist_ticks, DOWN, buff=0.1).set_x(hist_box.get_x())
+
         self.add(bath_line, bath_lbl, link, link_lbl, tes, tes_lbl)
         self.add(axes, box, y_lbl, x_lbl)
+        self.add(hist_box, hist_y_lbl, hist_ticks, hist_x_lbl)
 
         # --- 4. ANIMATION LOGIC ---
         time_tracker = ValueTracker(0)
@@ -110,7 +162,7 @@ class Microcal(Scene):
         # A) TES Color Updater
         tes.add_updater(lambda m: m.set_fill(
             color=interpolate_color(BLUE, RED,
-                                    (np.interp(time_tracker.get_value(), time_array, temp_array) - 0.5) / 6.0)
+                                    min(1.0, (np.interp(time_tracker.get_value(), time_array, temp_array) - 0.5) / 6.0))
         ))
 
         # B) Graph Updater
@@ -135,54 +187,146 @@ class Microcal(Scene):
                 # Vectorized coordinate mapping is not easy in Manim, sticking to list comp
                 # But 'current_times' is high res (thousands of points).
                 # Optimization: Downsample ONLY for drawing, but keep enough for smoothness
-                # We skip every 2nd point to save rendering time while keeping shape
-                step = 2
+                # We skip points to save rendering time while keeping shape
+                step = draw_step
                 points = [
                     axes.coords_to_point(t, T)
-                    for t, T in zip(rel_times[::step], current_temps[::step])
+                    # Clip to the scope box in case of a rare large pile-up
+                    for t, T in zip(rel_times[::step], np.minimum(current_temps[::step], scope_max))
                 ]
                 mob.set_points_as_corners(points)
 
         graph_line.add_updater(update_graph)
 
         # C) Photons
+        # A fixed pool of photon mobjects is recycled: event k is always drawn
+        # by slot k % pool_size, which picks up its color and direction.
         photons = VGroup()
+        pool_size = 8
 
-        # Directions: Top-Left, Top-Right, Top
-        directions = [normalize(UP + LEFT), normalize(UP + RIGHT), UP]
-        rotations = [-45 * DEGREES, 45 * DEGREES, 90 * DEGREES]
-
-        for i in range(3):
+        for _ in range(pool_size):
             p = FunctionGraph(
                 lambda x: 0.15 * np.sin(30 * x) * np.exp(-x ** 2 * 5),
-                x_range=[-1, 1],
-                color=photon_colors[i]
-            )
-            p.rotate(rotations[i])
-            p.hit_time = impact_times[i]
-            p.direction = directions[i]
+                x_range=[-1, 1, 0.01 / max(0.5, spatial_detail())]
+            ).set_opacity(0)
+            p.event = -1
+            p.angle = 0.0
             photons.add(p)
 
         def update_photons(mob):
             t_now = time_tracker.get_value()
             target = tes.get_center()
             speed = 5.0
-            for p in mob:
-                dt_hit = p.hit_time - t_now
-                if dt_hit > 0:
-                    p.move_to(target + p.direction * (speed * dt_hit)).set_opacity(1)
-                elif dt_hit > -0.1:
+            max_travel = 8.0  # Beyond this the photon is off screen
+            next_idx = np.searchsorted(impact_times, t_now)
+            for slot, p in enumerate(mob):
+                k = next_idx + (slot - next_idx) % pool_size
+                if k >= n_events:
                     p.set_opacity(0)
+                    continue
+                if p.event != k:
+                    p.event = k
+                    p.set_color(line_colors[event_lines[k]])
+                    p.rotate(event_angles[k] - p.angle)
+                    p.angle = event_angles[k]
+
+                dt_hit = impact_times[k] - t_now
+                if 0 < dt_hit and speed * dt_hit < max_travel:
+                    direction = np.array([np.cos(p.angle), np.sin(p.angle), 0])
+                    p.move_to(target + direction * (speed * dt_hit)).set_opacity(1)
                 else:
                     p.set_opacity(0)
 
         photons.add_updater(update_photons)
         self.add(photons)
 
+        # D) Energy Spectrum
+        # Pulses are detected from temp_array as samples scroll into the scope:
+        # a steep rise arms the trigger and the first downturn marks the peak.
+        # The pulse height is measured against the tail of any earlier pulse,
+        # extrapolated from the onset to the peak, which corrects the featured
+        # pile-up (t2 rides on t1's tail). Heights beyond energy_max are out of
+        # range and dropped rather than stacked into the last bin. Bins are
+        # preallocated and only bars whose counts changed are redrawn, so
+        # memory and per-frame cost stay constant no matter how many events
+        # arrive.
+        baseline = 0.5
+        bin_width = energy_max / n_bins
+        trigger_slope = 10.0  # Temperature units per unit time
+
+        counts = np.zeros(n_bins, dtype=int)
+        bar_width = hist_box.width / n_bins
+        hist_origin = hist_box.get_corner(DL)
+
+        spectrum = {
+            "last_idx": max(1, np.searchsorted(time_array, 0)),
+            "in_pulse": False,
+            "onset": 0.0,
+            "onset_idx": 0,
+            "ceiling": 4,  # Count mapped to full box height, doubled on overflow
+        }
+
+        bars = VGroup(*[
+            VMobject(fill_color=YELLOW, fill_opacity=0.8, stroke_width=0)
+            for _ in range(n_bins)
+        ])
+
+        def draw_bar(k):
+            height = hist_box.height * counts[k] / spectrum["ceiling"]
+            left = hist_origin + RIGHT * (k * bar_width)
+            right = left + RIGHT * bar_width
+            bars[k].set_points_as_corners([left, right, right + UP * height, left + UP * height, left])
+
+        for k in range(n_bins):
+            draw_bar(k)
+
+        def update_spectrum(mob):
+            idx_end = np.searchsorted(time_array, time_tracker.get_value())
+            dirty = set()
+
+            for i in range(spectrum["last_idx"], idx_end):
+                prev_T = temp_array[i - 1]
+                T = temp_array[i]
+                if not spectrum["in_pulse"]:
+                    if (T - prev_T) / dt > trigger_slope:
+                        spectrum["in_pulse"] = True
+                        spectrum["onset"] = prev_T
+                        spectrum["onset_idx"] = i - 1
+                elif T < prev_T:
+                    spectrum["in_pulse"] = False
+                    rise_time = (i - 1 - spectrum["onset_idx"]) * dt
+                    tail = baseline + (spectrum["onset"] - baseline) * np.exp(-rise_time / decay_tau)
+                    height = prev_T - tail
+                    if height >= energy_max:
+                        continue
+                    k = int(height / bin_width)
+                    counts[k] += 1
+                    dirty.add(k)
+
+            spectrum["last_idx"] = max(spectrum["last_idx"], idx_end)
+
+            if not dirty:
+                return
+            if counts.max() > spectrum["ceiling"]:
+                # Rare rescale: every bar height changes
+                while counts.max() > spectrum["ceiling"]:
+                    spectrum["ceiling"] *= 2
+                dirty = range(n_bins)
+            for k in dirty:
+                draw_bar(k)
+
+        bars.add_updater(update_spectrum)
+        self.add(bars)
+
         # --- 5. RUN ---
-        # Start at 0, end at sim_end_time
+        # Start at 0, play the featured impacts, then fast-forward the stream
+        self.play(
+            time_tracker.animate.set_value(feature_end_time),
+            run_time=feature_duration,
+            rate_func=linear
+        )
         self.play(
             time_tracker.animate.set_value(sim_end_time),
-            run_time=animation_duration,
+            run_time=stream_duration,
             rate_func=linear
         )
\ No newline at end of file
@@ -1,6 +1,8 @@
 from manim import *
 import numpy as np
 
+from lod import arrow_detail, scaled_count
+
 
 class SuperconductingLoops(Scene):
     def construct(self):
@@ -85,6 +87,10 @@ class SuperconductingLoops(Scene):
         ARROW_TIP_RATIO = 0.25
         ARROW_SCALE_BASE = 0.18
 
+        # Level of detail (1.0 at 4k; drafts use fewer arrows and arc segments)
+        ARROW_DETAIL = arrow_detail()
+        ARC_COMPONENTS = scaled_count(9, minimum=4)
+
         # Animation & Laser
         LASER_RADIUS = 0.15
         TIME_SCALE = 1.8
@@ -138,7 +144,7 @@ class SuperconductingLoops(Scene):
 
             top_line = Line(left_pt, right_pt, color=COLOR_WIRE, stroke_width=WIRE_THICKNESS)
             bottom_arc = ArcBetweenPoints(left_pt, right_pt, angle=-angle_rad, color=COLOR_WIRE,
-                                          stroke_width=WIRE_THICKNESS)
+                                          stroke_width=WIRE_THICKNESS, num_components=ARC_COMPONENTS)
             joints = VGroup(Dot(left_pt, color=COLOR_WIRE, radius=WIRE_THICKNESS / 200),
                             Dot(right_pt, color=COLOR_WIRE, radius=WIRE_THICKNESS / 200))
 
@@ -160,7 +166,7 @@ class SuperconductingLoops(Scene):
                                stroke_width=1.5))
 
             dial_arc = Arc(radius=DIAL_RADIUS, angle=PI, start_angle=0, arc_center=dial_pos, color=COLOR_TEXT,
-                           stroke_width=2)
+                           stroke_width=2, num_components=ARC_COMPONENTS)
             dial_base = Line(dial_pos + LEFT * DIAL_RADIUS, dial_pos + RIGHT * DIAL_RADIUS, color=COLOR_TEXT,
                              stroke_width=2)
             needle = Line(dial_pos, dial_pos + LEFT * DIAL_RADIUS * 0.9, color=COLOR_NEEDLE, stroke_width=3)
@@ -284,7 +290,7 @@ class SuperconductingLoops(Scene):
                 length = 1.0
 
             if current_val < 0.01: return grp
-            density = 3 * current_val
+            density = 3 * current_val * ARROW_DETAIL
             count = max(1, int(length * density))
             scale = ARROW_SCALE_BASE
 
@@ -0,0 +1,286 @@
+import argparse
+import ast
+import collections
+import importlib
+import multiprocessing as mp
+import os
+import queue
+import time
+
+from manim import BOLD, NORMAL, MathTex, Text, config, tempconfig
+from manim.constants import QUALITIES
+
+# Persistent local render pool.
+# Interpreter start-up, the manim import, font discovery ("Arial", "Inter")
+# and the LaTeX cache are paid for once, then every job reuses them:
+#   - The parent warms up once, before any worker starts: it lays out one
+#     Text per font/weight the scenes use and compiles the digits the Axes
+#     labels are built from. The LaTeX output lands in the shared on-disk
+#     cache under media/Tex, which the workers then only read.
+#   - With the "fork" start method the workers also inherit the loaded
+#     modules and the discovered fonts copy-on-write. With "spawn" (Windows)
+#     each worker imports manim and the scenes once on start-up.
+# Each worker has its own inbox and receives one job at a time, so the parent
+# always knows which job a worker holds, even if the worker is killed.
+# Each job renders into <video_dir>/<batch>/job<id>, where <batch> is unique
+# per pool, so jobs never share partial movie files or overwrite outputs.
+#
+# Example:
+#   python render_pool.py -w 2 SuperconductingLoops:l Microcal:l Microcal:k:60
+
+SCENE_MODULES = {
+    "SuperconductingLoops": "persistentcurrent_animation",
+    "Microcal": "microcal",
+}
+
+# What each scene needs warmed: (font, weight) pairs of its Text objects and
+# the LaTeX strings of its Axes number labels
+SCENE_FONTS = {
+    "SuperconductingLoops": [("Arial", NORMAL), ("Arial", BOLD)],
+    "Microcal": [("Inter", NORMAL)],
+}
+SCENE_TEX = {
+    "SuperconductingLoops": list("0123456789"),
+    "Microcal": [],
+}
+
+# Same single-letter flags as the manim CLI (-ql, -qm, -qh, -qp, -qk)
+QUALITY_FLAGS = {q["flag"]: q for q in QUALITIES.values() if q["flag"]}
+
+# How often completed() checks on the workers while waiting for results
+POLL_INTERVAL = 1.0
+
+
+def load_scene(scene_name):
+    module = importlib.import_module(SCENE_MODULES[scene_name])
+    return getattr(module, scene_name)
+
+
+def warm_caches(scene_names):
+    for scene_name in scene_names:
+        load_scene(scene_name)
+        for font, weight in SCENE_FONTS[scene_name]:
+            Text("Warm", font=font, weight=weight)
+        for tex in SCENE_TEX[scene_name]:
+            MathTex(tex)
+
+
+def render_job(job):
+    quality = QUALITY_FLAGS[job["quality"]]
+    module_name = SCENE_MODULES[job["scene"]]
+    options = {
+        "pixel_width": quality["pixel_width"],
+        "pixel_height": quality["pixel_height"],
+        "frame_rate": job["fps"] or quality["frame_rate"],
+        "write_to_movie": True,
+        # Module name in the path as with `manim <module>.py <Scene>`
+        "input_file": f"{module_name}.py",
+    }
+    options.update(job["overrides"])
+    # Partial movie files and the final movie both live under video_dir;
+    # a per-job folder keeps concurrent and earlier jobs apart
+    video_dir = options.get("video_dir", config["video_dir"])
+    options["video_dir"] = f"{video_dir}/{job['batch']}/job{job['id']}"
+
+    with tempconfig(options):
+        scene = load_scene(job["scene"])()
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def _worker(index, inbox, results):
+    try:
+        for scene_name in SCENE_MODULES:
+            load_scene(scene_name)
+    except Exception as e:
+        results.put(("dead", index, f"{type(e).__name__}: {e}"))
+        return
+
+    for job in iter(inbox.get, None):
+        started = time.time()
+        try:
+            output, error = render_job(job), None
+        except Exception as e:
+            output, error = None, f"{type(e).__name__}: {e}"
+        finished = time.time()
+
+        results.put(("done", index, {
+            **job,
+            "output": output,
+            "error": error,
+            "queued_s": started - job["submitted"],
+            "render_s": finished - started,
+        }))
+
+
+class RenderPool:
+    def __init__(self, workers=2, warm_scenes=tuple(SCENE_MODULES)):
+        start_method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.batch = f"batch-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.results = ctx.Queue()
+        self._next_id = 0
+        self._pending = {}  # job id -> job, until its result is returned
+        self._backlog = collections.deque()  # submitted, not yet handed to a worker
+        self._assigned = {}  # worker index -> job id it holds
+        self._worker_errors = {}  # worker index -> reason it exited
+
+        warm_caches(warm_scenes)
+
+        self.inboxes = [ctx.Queue() for _ in range(workers)]
+        self.workers = [
+            ctx.Process(target=_worker, args=(i, inbox, self.results), daemon=True)
+            for i, inbox in enumerate(self.inboxes)
+        ]
+        for w in self.workers:
+            w.start()
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def submit(self, scene, quality="l", fps=None, overrides=None):
+        if scene not in SCENE_MODULES:
+            raise KeyError(f"Unknown scene {scene!r}, expected one of {sorted(SCENE_MODULES)}")
+        if quality not in QUALITY_FLAGS:
+            raise KeyError(f"Unknown quality {quality!r}, expected one of {sorted(QUALITY_FLAGS)}")
+        overrides = dict(overrides or {})
+        unknown = [key for key in overrides if key not in config]
+        if unknown:
+            raise KeyError(f"Unknown config option(s): {', '.join(unknown)}")
+
+        job_id = self._next_id
+        self._next_id += 1
+        job = {
+            "id": job_id,
+            "batch": self.batch,
+            "scene": scene,
+            "quality": quality,
+            "fps": fps,
+            "overrides": overrides,
+            "submitted": time.time(),
+        }
+        self._pending[job_id] = job
+        self._backlog.append(job)
+        self._dispatch()
+        return job_id
+
+    def _dispatch(self):
+        # Hand queued jobs to idle live workers, recording the assignment here
+        for index, w in enumerate(self.workers):
+            if not self._backlog:
+                return
+            if index in self._assigned or index in self._worker_errors or not w.is_alive():
+                continue
+            job = self._backlog.popleft()
+            self._assigned[index] = job["id"]
+            self.inboxes[index].put(job)
+
+    def _failed(self, job_id, error):
+        job = self._pending.pop(job_id)
+        return {**job, "output": None, "error": error,
+                "queued_s": time.time() - job["submitted"], "render_s": 0.0}
+
+    def completed(self):
+        # Yield results as they finish until every submitted job is accounted
+        # for. The job held by a worker that died is failed instead of waited on.
+        while self._pending:
+            try:
+                kind, index, payload = self.results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                yield from self._reap_workers()
+                continue
+
+            if kind == "done":
+                self._assigned.pop(index, None)
+                self._pending.pop(payload["id"], None)
+                self._dispatch()
+                yield payload
+            elif kind == "dead":
+                self._worker_errors[index] = payload
+                yield from self._reap_workers()
+
+    def _reap_workers(self):
+        for index, w in enumerate(self.workers):
+            if w.is_alive() and index not in self._worker_errors:
+                continue
+            reason = self._worker_errors.setdefault(index, f"worker exited with code {w.exitcode}")
+            job_id = self._assigned.pop(index, None)
+            if job_id in self._pending:
+                yield self._failed(job_id, reason)
+
+        if all(index in self._worker_errors for index in range(len(self.workers))):
+            # Nobody is left to take the queued jobs
+            reason = "; ".join(sorted(set(self._worker_errors.values())))
+            while self._backlog:
+                yield self._failed(self._backlog.popleft()["id"], f"no live workers ({reason})")
+        else:
+            self._dispatch()
+
+    def close(self):
+        for inbox, w in zip(self.inboxes, self.workers):
+            if w.is_alive():
+                inbox.put(None)
+        for w in self.workers:
+            w.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_job(spec):
+    # "Scene:quality[:fps]", e.g. "Microcal:k:60"
+    parts = spec.split(":")
+    if not 1 <= len(parts) <= 3:
+        raise argparse.ArgumentTypeError(f"Bad job {spec!r}, expected Scene[:quality[:fps]]")
+    scene = parts[0]
+    quality = parts[1] if len(parts) > 1 else "l"
+    if scene not in SCENE_MODULES:
+        raise argparse.ArgumentTypeError(f"Unknown scene {scene!r}, expected one of {sorted(SCENE_MODULES)}")
+    if quality not in QUALITY_FLAGS:
+        raise argparse.ArgumentTypeError(f"Unknown quality {quality!r}, expected one of {sorted(QUALITY_FLAGS)}")
+    try:
+        fps = int(parts[2]) if len(parts) > 2 else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Bad fps {parts[2]!r} in job {spec!r}")
+    return scene, quality, fps
+
+
+def parse_override(item):
+    key, sep, value = item.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Bad override {item!r}, expected key=value")
+    if key not in config:
+        raise argparse.ArgumentTypeError(f"Unknown config option {key!r}")
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        pass
+    return key, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render several scenes on a pool of warm manim workers.")
+    parser.add_argument("jobs", nargs="+", type=parse_job, help="Scene[:quality[:fps]], quality in l/m/h/p/k")
+    parser.add_argument("-w", "--workers", type=int, default=2)
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="KEY=VALUE", help="manim config override applied to every job")
+    args = parser.parse_args()
+
+    with RenderPool(workers=args.workers, warm_scenes=sorted({scene for scene, _, _ in args.jobs})) as pool:
+        for scene, quality, fps in args.jobs:
+            pool.submit(scene, quality, fps, dict(args.overrides))
+
+        for r in pool.completed():
+            fps = r["fps"] or QUALITY_FLAGS[r["quality"]]["frame_rate"]
+            status = r["output"] if r["error"] is None else f"FAILED ({r['error']})"
+            print(f"[{r['id']}] {r['scene']} -q{r['quality']} @ {fps}fps: "
+                  f"queued {r['queued_s']:.2f}s, render {r['render_s']:.2f}s -> {status}")
+
+
+if __name__ == "__main__":
+    main()